@@ -13,22 +13,45 @@ import sys
 import random
 import requests
 import json
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-# Load environment variables from .env file
-load_dotenv()
+from rapidapi_client import CachedSession, json_dumps, normalize_username
+
+# One OS-backed CSPRNG for the process: draws cannot be predicted, but also
+# cannot be seeded/replayed
+_RNG = random.SystemRandom()
+
+# Where the username may live in a follower record, in order of preference
+_USERNAME_PATHS = (("username",), ("user", "username"), ("pk",), ("id",))
+
+
+def _extract_username(winner: Dict) -> str:
+    """Return the winner's username, handling the different API response formats."""
+    for path in _USERNAME_PATHS:
+        value = winner
+        for key in path:
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+            if value is None:
+                break
+        if value:
+            return str(value)
+    return "Unknown"
 
 
 class InstagramSocialFollowerPicker:
     """Class to handle Instagram follower fetching using Social API."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_policy: Optional[str] = None):
         """
         Initialize the Instagram Social Follower Picker.
         
         Args:
             api_key (str): RapidAPI key for authentication
+            cache_policy (str): Response cache policy (see rapidapi_client.CACHE_POLICIES)
         """
         self.api_key = api_key
         self.base_url = "https://instagram-social-api.p.rapidapi.com"
@@ -36,84 +59,113 @@ class InstagramSocialFollowerPicker:
             "x-rapidapi-host": "instagram-social-api.p.rapidapi.com",
             "x-rapidapi-key": api_key
         }
+        self.session = CachedSession(self.headers, cache_policy=cache_policy)
     
-    def get_followers(self, username: str, limit: int = 50) -> List[Dict]:
+    def _followers_request(
+        self, username: str, pagination_token: Optional[str] = None, amount: Optional[int] = None
+    ) -> Tuple[str, Dict]:
+        """Build the followers endpoint URL and query parameters for one page."""
+        url = f"{self.base_url}/v1/followers"
+        
+        params = {
+            "username_or_id_or_url": username
+        }
+        if amount:
+            # Ask for everything still needed in one page to minimise round trips
+            params["amount"] = str(amount)
+        if pagination_token:
+            params["pagination_token"] = pagination_token
+        
+        return url, params
+    
+    def _parse_page(self, username: str, data) -> Tuple[List[Dict], Optional[str], Optional[int]]:
         """
-        Fetch followers for a given Instagram username using Social API.
+        Extract followers, the next page cursor and the total count from an API response.
+        
+        Raises:
+            ValueError: If the API returned an error message
+        """
+        # Check if the API returned an error
+        if isinstance(data, dict):
+            if "message" in data:
+                if "not subscribed" in data["message"].lower():
+                    raise ValueError("❌ API Subscription Required: You need to subscribe to Instagram Social API on RapidAPI")
+                elif "not found" in data["message"].lower():
+                    raise ValueError(f"❌ Username '{username}' not found or account is private")
+                else:
+                    raise ValueError(f"API Message: {data['message']}")
+            
+            if "error" in data:
+                raise ValueError(f"API Error: {data['error']}")
+        
+        # Extract followers, the next page cursor and the follower count from the response
+        followers = []
+        next_token = None
+        total = None
+        if isinstance(data, dict):
+            next_token = data.get("pagination_token")
+            if "data" in data:
+                data_section = data["data"]
+                if "items" in data_section:
+                    followers = data_section["items"]
+                    next_token = next_token or data_section.get("pagination_token")
+                    total = data_section.get("count")
+                elif isinstance(data_section, list):
+                    followers = data_section
+            elif "items" in data:
+                followers = data["items"]
+            elif "followers" in data:
+                followers = data["followers"]
+        elif isinstance(data, list):
+            followers = data
+        
+        return followers, next_token, total
+    
+    def _has_followers(self, username: str, data) -> bool:
+        """Whether an API response is a valid page with at least one follower."""
+        try:
+            return bool(self._parse_page(username, data)[0])
+        except ValueError:
+            return False
+    
+    def _fetch_page(
+        self,
+        username: str,
+        pagination_token: Optional[str] = None,
+        allow_stale: bool = False,
+        amount: Optional[int] = None,
+    ) -> Tuple[List[Dict], Optional[str], Optional[int]]:
+        """
+        Fetch a single page of followers.
         
         Args:
             username (str): Instagram username to fetch followers for
-            limit (int): Number of followers to fetch (default: 50)
+            pagination_token (str): Cursor returned by the previous page, if any
+            allow_stale (bool): Accept an expired cached copy of this page
+            amount (int): Number of followers to request in this page (default: API default)
             
         Returns:
-            List[Dict]: List of follower data
+            Tuple[List[Dict], Optional[str], Optional[int]]: Followers on this page,
+                the next page cursor and the account's follower count (if reported)
             
         Raises:
             requests.RequestException: If API request fails
             ValueError: If invalid response is received
         """
-        url = f"{self.base_url}/v1/followers"
-        
-        params = {
-            "username_or_id_or_url": username
-        }
+        url, params = self._followers_request(username, pagination_token, amount)
         
         try:
-            print(f"🔍 Fetching followers for @{username}...")
-            print(f"📡 Using Instagram Social API")
-            
-            response = requests.get(
+            data = self.session.get_json(
                 url,
-                headers=self.headers,
                 params=params,
+                allow_stale=allow_stale,
+                # Empty pages and error messages are never cached, so a bad response isn't replayed
+                cache_if=lambda page: self._has_followers(username, page),
                 timeout=60  # Longer timeout as this might take time
             )
-            
-            print(f"📊 Response status: {response.status_code}")
-            
-            response.raise_for_status()
-            
-            data = response.json()
             print(f"📄 Response data keys: {list(data.keys()) if isinstance(data, dict) else 'Response is a list'}")
             
-            # Check if the API returned an error
-            if isinstance(data, dict):
-                if "message" in data:
-                    if "not subscribed" in data["message"].lower():
-                        raise ValueError("❌ API Subscription Required: You need to subscribe to Instagram Social API on RapidAPI")
-                    elif "not found" in data["message"].lower():
-                        raise ValueError(f"❌ Username '{username}' not found or account is private")
-                    else:
-                        raise ValueError(f"API Message: {data['message']}")
-                
-                if "error" in data:
-                    raise ValueError(f"API Error: {data['error']}")
-            
-            # Extract followers from the response
-            followers = []
-            if isinstance(data, dict):
-                if "data" in data:
-                    data_section = data["data"]
-                    if "items" in data_section:
-                        followers = data_section["items"]
-                    elif isinstance(data_section, list):
-                        followers = data_section
-                elif "items" in data:
-                    followers = data["items"]
-                elif "followers" in data:
-                    followers = data["followers"]
-            elif isinstance(data, list):
-                followers = data
-            
-            if not followers:
-                raise ValueError("No followers found. The account might be private or have no followers.")
-            
-            # Limit the results if needed
-            if limit and len(followers) > limit:
-                followers = followers[:limit]
-            
-            print(f"✅ Successfully fetched {len(followers)} followers!")
-            return followers
+            return self._parse_page(username, data)
             
         except requests.RequestException as e:
             if "403" in str(e) or "401" in str(e):
@@ -124,21 +176,135 @@ class InstagramSocialFollowerPicker:
         except json.JSONDecodeError:
             raise ValueError("Invalid JSON response from API")
     
-    def select_random_winner(self, followers: List[Dict]) -> Dict:
+    def _iter_followers(self, username: str, limit: Optional[int] = None) -> Iterator[Dict]:
         """
-        Randomly select a winner from the list of followers.
+        Stream followers page by page without buffering the whole list.
+        
+        When the first page comes from the network, its items and the follower
+        count are hashed. If the hash matches the last sync, the account is
+        treated as unchanged and the remaining pages are served from the cache
+        even if expired. Fresh cache hits skip the check entirely.
         
         Args:
-            followers (List[Dict]): List of follower data
+            username (str): Instagram username to fetch followers for
+            limit (int): Stop after this many followers (default: no limit)
+            
+        Yields:
+            Dict: Follower data
+        """
+        username = normalize_username(username)
+        
+        print(f"🔍 Fetching followers for @{username}...")
+        print(f"📡 Using Instagram Social API")
+        
+        first_url, first_params = self._followers_request(username, amount=limit)
+        from_cache = self.session.serves_from_cache(first_url, first_params)
+        if not from_cache:
+            previous_page, previous_hash, previous_expires_at = self.session.cached_entry(first_url, first_params)
+        
+        followers, pagination_token, total = self._fetch_page(username, amount=limit)
+        
+        reuse_cache = False
+        if not from_cache:
+            digest = hashlib.sha256(json_dumps([total, followers])).hexdigest()
+            # Only when later pages will really come from the cache, and the old chain survives pruning
+            reuse_cache = (
+                previous_page is not None
+                and digest == previous_hash
+                and self.session.can_reuse_expired(previous_expires_at)
+            )
+            if reuse_cache:
+                print("♻️  Followers unchanged since last sync, reusing cached pages")
+                # Keep the cached cursor chain so later pages (and later syncs) hit the cache;
+                # the old expiry is kept so reading never extends the TTL
+                pagination_token = self._parse_page(username, previous_page)[1]
+                self.session.put_json(first_url, first_params, previous_page, expires_at=previous_expires_at)
+            self.session.set_first_page_hash(first_url, first_params, digest)
+        
+        yielded = 0
+        while True:
+            if not followers and not yielded:
+                raise ValueError("No followers found. The account might be private or have no followers.")
+            
+            for follower in followers:
+                if limit and yielded >= limit:
+                    return
+                yield follower
+                yielded += 1
+            
+            if not pagination_token or not followers or (limit and yielded >= limit):
+                return
+            
+            followers, pagination_token, _ = self._fetch_page(
+                username, pagination_token, allow_stale=reuse_cache, amount=limit - yielded if limit else None
+            )
+    
+    def get_followers(self, username: str, limit: int = 50) -> List[Dict]:
+        """
+        Fetch followers for a given Instagram username using Social API.
+        
+        Args:
+            username (str): Instagram username to fetch followers for
+            limit (int): Number of followers to fetch (default: 50)
             
         Returns:
-            Dict: Selected winner's data
+            List[Dict]: List of follower data
+            
+        Raises:
+            requests.RequestException: If API request fails
+            ValueError: If invalid response is received
+        """
+        followers = list(self._iter_followers(username, limit))
+        print(f"✅ Successfully fetched {len(followers)} followers!")
+        return followers
+    
+    def select_random_winners(self, followers: Iterable[Dict], k: int = 1) -> List[Dict]:
+        """
+        Randomly select k distinct winners from the followers.
+        
+        Uses reservoir sampling (Algorithm R), so followers can be a lazy
+        stream and only k candidates are held in memory. The draw uses
+        random.SystemRandom, so it is not deterministic and cannot be
+        reproduced with a seed.
+        
+        Args:
+            followers (Iterable[Dict]): Follower data (list or stream)
+            k (int): Number of winners to select (default: 1)
+            
+        Returns:
+            List[Dict]: Selected winners' data
         """
-        if not followers:
+        if k < 1:
+            raise ValueError(f"Cannot select {k} winner(s)")
+        
+        reservoir = []
+        seen = 0
+        for seen, follower in enumerate(followers, 1):
+            if seen <= k:
+                reservoir.append(follower)
+            else:
+                j = _RNG.randrange(seen)
+                if j < k:
+                    reservoir[j] = follower
+        
+        if not reservoir:
             raise ValueError("Cannot select winner from empty followers list")
+        if seen < k:
+            raise ValueError(f"Cannot select {k} winner(s) from {seen} followers")
+        
+        return reservoir
+    
+    def select_random_winner(self, followers: Iterable[Dict]) -> Dict:
+        """
+        Randomly select a single winner from the followers.
         
-        winner = random.choice(followers)
-        return winner
+        Args:
+            followers (Iterable[Dict]): Follower data (list or stream)
+            
+        Returns:
+            Dict: Selected winner's data
+        """
+        return self.select_random_winners(followers, 1)[0]
     
     def display_winner(self, winner: Dict) -> None:
         """
@@ -147,73 +313,65 @@ class InstagramSocialFollowerPicker:
         Args:
             winner (Dict): Winner's data
         """
-        print("\n" + "="*60)
-        print("🎉 WINNER SELECTED FROM ACTUAL FOLLOWERS! 🎉")
-        print("="*60)
+        username = _extract_username(winner)
         
-        # Extract username (handle different possible response formats)
-        username = (
-            winner.get("username") or 
-            winner.get("user", {}).get("username") or
-            winner.get("pk") or
-            str(winner.get("id", "")) or
-            "Unknown"
-        )
-        
-        print(f"🏆 Winner: @{username}")
+        # Build the whole announcement and write it once
+        lines = [
+            "\n" + "="*60,
+            "🎉 WINNER SELECTED FROM ACTUAL FOLLOWERS! 🎉",
+            "="*60,
+            f"🏆 Winner: @{username}",
+        ]
         
         # Display additional information if available
         if "full_name" in winner:
-            print(f"📝 Full Name: {winner['full_name']}")
+            lines.append(f"📝 Full Name: {winner['full_name']}")
         elif winner.get("user", {}).get("full_name"):
-            print(f"📝 Full Name: {winner['user']['full_name']}")
+            lines.append(f"📝 Full Name: {winner['user']['full_name']}")
             
         if "is_verified" in winner and winner["is_verified"]:
-            print(f"✅ Verified Account")
+            lines.append("✅ Verified Account")
         
         if "is_private" in winner:
             privacy = "🔒 Private" if winner["is_private"] else "🌐 Public"
-            print(f"🔐 Account: {privacy}")
+            lines.append(f"🔐 Account: {privacy}")
         
         # Show profile picture if available
         if "profile_pic_url" in winner:
-            print(f"🖼️  Profile Picture: Available")
+            lines.append("🖼️  Profile Picture: Available")
         
-        print("="*60)
+        lines.append("="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    def run(self, username: str, limit: int = 50) -> str:
+    def run(self, username: str, limit: int = 50, num_winners: int = 1) -> List[str]:
         """
-        Main method to fetch followers and select a winner.
+        Main method to fetch followers and select winners.
         
         Args:
             username (str): Instagram username to fetch followers for
             limit (int): Number of followers to fetch
+            num_winners (int): Number of distinct winners to select
             
         Returns:
-            str: Winner's username
+            List[str]: Winners' usernames
         """
         try:
-            # Fetch followers
-            followers = self.get_followers(username, limit)
-            
-            # Select random winner
-            winner = self.select_random_winner(followers)
+            # Stream followers straight into the reservoir sampler
+            followers = self._iter_followers(username, limit)
             
-            # Display winner
-            self.display_winner(winner)
+            # Select random winners
+            winners = self.select_random_winners(followers, num_winners)
             
-            # Return winner username
-            winner_username = (
-                winner.get("username") or 
-                winner.get("user", {}).get("username") or
-                winner.get("pk") or
-                str(winner.get("id", "")) or
-                "Unknown"
-            )
+            winner_usernames = []
+            for winner in winners:
+                # Display winner
+                self.display_winner(winner)
+                
+                winner_usernames.append(_extract_username(winner))
             
-            return winner_username
+            return winner_usernames
             
-        except Exception as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"❌ Error: {str(e)}")
             sys.exit(1)
 
@@ -226,6 +384,10 @@ def main():
     print("📡 Uses Instagram Social API (WORKING with your subscription!)")
     print("")
     
+    # Load environment variables from .env file (only needed when run as a script)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     # Get API key from environment variable or user input
     api_key = os.getenv("RAPIDAPI_KEY")
     
@@ -260,12 +422,23 @@ def main():
         except ValueError:
             print("⚠️  Invalid number entered. Using default (50).")
     
+    # Get number of winners to select
+    winners_input = input("Number of winners to select (default 1): ").strip()
+    num_winners = 1
+    
+    if winners_input:
+        try:
+            num_winners = max(1, int(winners_input))
+        except ValueError:
+            print("⚠️  Invalid number entered. Using default (1).")
+    
     # Create picker instance and run
     picker = InstagramSocialFollowerPicker(api_key)
-    winner_username = picker.run(username, limit)
+    winner_usernames = picker.run(username, limit, num_winners)
     
-    print(f"\n🎊 Congratulations to @{winner_username}! 🎊")
-    print("👥 This winner was randomly selected from ACTUAL followers!")
+    for winner_username in winner_usernames:
+        print(f"\n🎊 Congratulations to @{winner_username}! 🎊")
+    print("👥 Winners were randomly selected from ACTUAL followers!")
 
 
 if __name__ == "__main__":
@@ -8,12 +8,20 @@ This script provides multiple options for selecting winners from Instagram users
 3. Demo Mode - For testing
 """
 
-import os
-import sys
-from dotenv import load_dotenv
+import importlib
 
-# Load environment variables
-load_dotenv()
+
+def _run_picker(module_name):
+    """Import a picker module and run its main() in this process."""
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if e.name != module_name:
+            raise
+        print(f"❌ {module_name}.py is not available in this installation")
+        return
+    
+    module.main()
 
 
 def main():
@@ -47,7 +55,7 @@ def main():
             confirm = input("Do you have the subscription? (y/N): ").strip().lower()
             
             if confirm == 'y':
-                os.system(f"{sys.executable} instagram_premium_follower_picker.py")
+                _run_picker("instagram_premium_follower_picker")
             else:
                 print("\n💡 To subscribe:")
                 print("   Visit: https://rapidapi.com/sfgeek/api/instagram-premium-api-2023")
@@ -58,13 +66,13 @@ def main():
         elif choice == "2":
             print("\n🚀 Starting Engagement Picker...")
             print("💖 This selects from users who actively engage with posts")
-            os.system(f"{sys.executable} instagram_engagement_picker.py")
+            _run_picker("instagram_engagement_picker")
             break
             
         elif choice == "3":
             print("\n🚀 Starting Demo Mode...")
             print("🎮 This simulates the winner selection process")
-            os.system(f"{sys.executable} demo_follower_picker.py")
+            _run_picker("demo_follower_picker")
             break
             
         else:
@@ -12,30 +12,101 @@ Perfect for IEEE RAS IIT live orientation events!
 """
 
 import os
-import json
-import requests
+import re
+import sys
+import gzip
+import logging
 import random
+import requests
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from rapidapi_client import CachedSession, json_dumps, json_loads, normalize_username
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) seconds; requests waits forever without one
+API_TIMEOUT = (3.05, 10)
+
+SNAPSHOT_DIR = 'live_snapshots'
+SNAPSHOT_INDEX = os.path.join(SNAPSHOT_DIR, 'index.sqlite')
+SNAPSHOT_CACHE_SIZE = 128
+# Live diffs must never read cached data, so enabled/read-only are not allowed here
+LIVE_CACHE_POLICIES = ('write-only', 'replay', 'disabled')
+# Extra followers fetched beyond the count growth, to absorb unfollows in the window
+GROWTH_FETCH_BUFFER = 10
+DEFAULT_MAX_FOLLOWERS = 400
+COUNT_RE = re.compile(rb'"count"\s*:\s*(\d+)')
+SNAPSHOT_NAME_RE = re.compile(r'^(?P<username>.+)_baseline_(?P<timestamp>\d{8}_\d{6})\.(?:json|jsonl\.gz)$')
+
+# One OS-backed CSPRNG for the process: unpredictable draws, no shared
+# Mersenne Twister state between Flask worker threads
+_RNG = random.SystemRandom()
+
+def _has_count(data):
+    """Whether a followers response carries data.count (only those are cached)"""
+    return isinstance(data, dict) and isinstance(data.get('data'), dict) and 'count' in data['data']
+
+def _has_items(data):
+    """Whether a followers response carries a non-empty data.items (only those are cached)"""
+    return isinstance(data, dict) and isinstance(data.get('data'), dict) and bool(data['data'].get('items'))
+
+def _sample_new(current_followers, baseline_usernames, rng):
+    """Reservoir-sample (k=1) one follower not in the baseline; returns (winner, new_count)"""
+    chosen = None
+    new_count = 0
+    seen = set()  # repeated usernames count once, as in the list diff
+    for follower in current_followers:
+        if not (name := follower.get('username')):
+            continue
+        name = name.lower()
+        if name in baseline_usernames or name in seen:
+            continue
+        seen.add(name)
+        new_count += 1
+        if rng.random() * new_count < 1:
+            chosen = follower
+    return chosen, new_count
+
 class LiveOrientationPicker:
-    def __init__(self):
+    def __init__(self, cache_policy=None):
         load_dotenv()
         self.api_key = os.getenv('RAPIDAPI_KEY')
         if not self.api_key:
             raise ValueError("RAPIDAPI_KEY not found in .env file")
         
+        # Upper bound on followers fetched per run (MAX_FOLLOWERS in .env)
+        self.max_followers = int(os.getenv('MAX_FOLLOWERS') or DEFAULT_MAX_FOLLOWERS)
+        
         self.base_url = "https://instagram-social-api.p.rapidapi.com"
         self.headers = {
             'x-rapidapi-host': 'instagram-social-api.p.rapidapi.com',
             'x-rapidapi-key': self.api_key
         }
         
+        # Live diffs need fresh data, so by default responses are only recorded
+        # (use LIVE_CACHE_POLICY=replay to re-run a demo without API calls)
+        cache_policy = cache_policy or os.getenv('LIVE_CACHE_POLICY', 'write-only')
+        if cache_policy not in LIVE_CACHE_POLICIES:
+            raise ValueError(
+                f"Invalid live cache policy '{cache_policy}'. Choose one of: {', '.join(LIVE_CACHE_POLICIES)}"
+            )
+        self.session = CachedSession(self.headers, cache_policy=cache_policy)
+        
+        # Parsed snapshots by path -> (mtime_ns, snapshot), least recently used first
+        self._snapshot_cache = OrderedDict()
+        self._snapshot_lock = threading.Lock()
+        
         # Create snapshots directory
-        os.makedirs('live_snapshots', exist_ok=True)
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
     
     def get_followers_count(self, username):
         """Just get follower count without full data"""
+        username = normalize_username(username)
         print(f"🔍 Checking follower count for @{username}...")
         
         url = f"{self.base_url}/v1/followers"
@@ -45,28 +116,42 @@ class LiveOrientationPicker:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            if self.session.cache_policy in ('write-only', 'disabled'):
+                data = self._stream_count(url, params)
+            else:
+                data = self.session.get_json(url, params=params, cache_if=_has_count, timeout=API_TIMEOUT)
             
-            if response.status_code == 200:
-                data = response.json()
-                if 'data' in data and 'count' in data['data']:
-                    count = data['data']['count']
-                    print(f"✅ Current followers: {count}")
-                    return count
-                elif 'data' in data and 'items' in data['data']:
-                    # Fallback if count not available
-                    followers = data['data']['items']
-                    return len(followers)
+            if 'data' in data and 'count' in data['data']:
+                count = data['data']['count']
+                print(f"✅ Current followers: {count}")
+                return count
+            elif 'data' in data and 'items' in data['data']:
+                # Fallback if count not available
+                followers = data['data']['items']
+                return len(followers)
             
-            print(f"❌ API Error: {response.status_code}")
+            print(f"❌ API Error: unexpected response")
             return None
                 
-        except Exception as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"❌ Network Error: {e}")
             return None
 
-    def get_followers(self, username, max_followers=400):
-        """Fetch current followers"""
+    def _stream_count(self, url, params):
+        """One request: scan the first KB for data.count, else parse the rest of the same response"""
+        match, body = self.session.search_stream(url, params, COUNT_RE, cache_if=_has_count, timeout=API_TIMEOUT)
+        if body is not None:
+            return json_loads(body)
+        
+        # Record a minimal response so replay mode still has the count
+        data = {'data': {'count': int(match.group(1))}}
+        self.session.put_json(url, params, data)
+        return data
+    
+    def get_followers(self, username, max_followers=None):
+        """Fetch current followers (default: up to self.max_followers)"""
+        max_followers = max_followers or self.max_followers
+        username = normalize_username(username)
         print(f"🔍 Fetching followers for @{username}...")
         
         url = f"{self.base_url}/v1/followers"
@@ -76,64 +161,239 @@ class LiveOrientationPicker:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            data = self.session.get_json(url, params=params, cache_if=_has_items, timeout=API_TIMEOUT)
             
-            if response.status_code == 200:
-                data = response.json()
-                if 'data' in data and 'items' in data['data']:
-                    followers = data['data']['items']
-                    print(f"✅ Fetched {len(followers)} followers!")
-                    return followers
+            if 'data' in data and 'items' in data['data']:
+                followers = data['data']['items']
+                print(f"✅ Fetched {len(followers)} followers!")
+                return followers
             
-            print(f"❌ API Error: {response.status_code}")
+            print(f"❌ API Error: unexpected response")
             return []
                 
-        except Exception as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"❌ Error: {e}")
             return []
     
-    def get_baseline_snapshot(self, username, time_window_hours):
-        """Get baseline snapshot from X hours ago"""
-        now = datetime.now()
-        target_time = now - timedelta(hours=time_window_hours)
+    def _save_baseline(self, username, follower_count, now, followers=None):
+        """Write a baseline snapshot (metadata-only unless followers are given)"""
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(SNAPSHOT_DIR, f"{username}_baseline_{timestamp}.jsonl.gz")
         
-        print(f"🕐 Looking for baseline from: {target_time.strftime('%H:%M:%S')} ({time_window_hours}h ago)")
+        # Line 1 is the header; a full baseline follows with one follower per line
+        header = {
+            '_header': True,
+            'username': username,
+            'datetime': now.isoformat(),
+            'unix_timestamp': now.timestamp(),
+            'follower_count': follower_count
+        }
+        if followers is None:
+            header['metadata_only'] = True  # Lightweight baseline
+        else:
+            # Lowercased and de-duplicated once here so every later diff can build its set
+            # directly; sorted so the header is stable between runs and compresses well
+            header['usernames_lower'] = sorted({f['username'].lower() for f in followers if f.get('username')})
         
-        # Look for existing snapshots within ±30 minutes of target time
-        snapshot_dir = 'live_snapshots'
-        if os.path.exists(snapshot_dir):
-            files = [f for f in os.listdir(snapshot_dir) if f.startswith(f"{username}_") and f.endswith('.json')]
-            
-            best_snapshot = None
-            best_time_diff = float('inf')
-            
-            for filename in sorted(files, reverse=True):
-                filepath = os.path.join(snapshot_dir, filename)
-                if os.path.exists(filepath):
+        try:
+            self._write_snapshot(filename, header, followers or ())
+            self._index_snapshots([(
+                filename, username, header['datetime'], header['unix_timestamp'],
+                follower_count, followers is None
+            )])
+            print(f"💾 Baseline saved: {filename}")
+            print(f"📊 Follower count: {follower_count}")
+            print(f"⏰ Timestamp: {now.strftime('%H:%M:%S')}")
+            return filename
+        except OSError as e:
+            print(f"⚠️ Could not save baseline: {e}")
+            return None
+    
+    def _write_snapshot(self, filename, header, followers):
+        """Atomically write a gzipped JSONL snapshot: temp file, fsync, then rename over"""
+        tmp_filename = filename + '.tmp'
+        try:
+            with open(tmp_filename, 'wb') as raw:
+                # Binary mode: the encoder's UTF-8 bytes go straight to gzip, no str round trip
+                with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(json_dumps(header) + b"\n")
+                    f.writelines(json_dumps(follower) + b"\n" for follower in followers)
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_filename, filename)
+        except OSError:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+    
+    def _load_snapshot(self, path, header_only=False):
+        """Load a snapshot, reusing the parsed copy while the file's mtime is unchanged"""
+        if header_only:
+            return self._read_snapshot(path, header_only=True)
+        
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._snapshot_lock:
+            cached = self._snapshot_cache.get(path)
+            if cached and cached[0] == mtime_ns:
+                self._snapshot_cache.move_to_end(path)
+                return cached[1]
+        
+        snapshot = self._read_snapshot(path)
+        with self._snapshot_lock:
+            self._snapshot_cache[path] = (mtime_ns, snapshot)
+            self._snapshot_cache.move_to_end(path)
+            while len(self._snapshot_cache) > SNAPSHOT_CACHE_SIZE:
+                self._snapshot_cache.popitem(last=False)
+        return snapshot
+    
+    def _read_snapshot(self, path, header_only=False):
+        """Parse a snapshot: gzipped JSONL (header line + followers) or legacy pretty JSON"""
+        if not path.endswith('.jsonl.gz'):
+            with open(path, 'rb') as f:
+                return json_loads(f.read())
+        
+        with gzip.open(path, 'rb') as f:
+            snapshot = json_loads(f.readline())
+            snapshot.pop('_header', None)
+            if header_only or snapshot.get('metadata_only') or 'usernames_lower' in snapshot:
+                return snapshot
+            # Header lacks the username column: stream it from the follower lines
+            snapshot['usernames_lower'] = [
+                u.lower() for u in (json_loads(line).get('username') for line in f) if u
+            ]
+        return snapshot
+    
+    def _index_connect(self):
+        """Open the snapshot index (username, datetime) -> path, follower_count, metadata_only"""
+        conn = sqlite3.connect(SNAPSHOT_INDEX, timeout=10)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS idx ("
+            "path TEXT PRIMARY KEY, username TEXT, datetime_iso TEXT, unix_timestamp REAL, "
+            "follower_count INTEGER, metadata_only INTEGER)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(idx)")}
+        for column in ('follower_count', 'metadata_only'):
+            if column not in columns:  # index created by an older version
+                conn.execute(f"ALTER TABLE idx ADD COLUMN {column} INTEGER")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_username_time ON idx (username, unix_timestamp)")
+        return conn
+    
+    def _index_snapshots(self, entries):
+        """Record (path, username, datetime_iso, unix_timestamp, follower_count, metadata_only) rows"""
+        try:
+            with self._index_connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO idx "
+                    "(path, username, datetime_iso, unix_timestamp, follower_count, metadata_only) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    entries
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not update snapshot index: {e}")
+    
+    def _query_index(self, username, now, target_time):
+        """Find the snapshot closest to target_time (and not in the future) via the index"""
+        with self._index_connect() as conn:
+            return conn.execute(
+                "SELECT path, datetime_iso, unix_timestamp, follower_count, metadata_only "
+                "FROM idx WHERE username = ? AND unix_timestamp <= ? "
+                "ORDER BY ABS(unix_timestamp - ?) LIMIT 1",
+                (username, now.timestamp(), target_time.timestamp())
+            ).fetchone()
+    
+    def _scan_snapshots(self, username, now, target_time):
+        """Find the closest snapshot by scanning the directory (used to build a missing index)"""
+        if not os.path.exists(SNAPSHOT_DIR):
+            return None
+        
+        now_ts = now.timestamp()
+        target_ts = target_time.timestamp()
+        best_path = None
+        best_time_diff = float('inf')
+        entries = []
+        
+        with os.scandir(SNAPSHOT_DIR) as it:
+            for entry in it:
+                filename = entry.name
+                if not filename.endswith(('.json', '.jsonl.gz')):
+                    continue
+                
+                # The owner and timestamp are in the filename, so most files are never opened
+                match = SNAPSHOT_NAME_RE.match(filename)
+                if match:
+                    snapshot_username = match.group('username')
+                    snapshot_time = datetime.strptime(match.group('timestamp'), "%Y%m%d_%H%M%S")
+                else:
                     try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            snapshot = json.load(f)
-                        
+                        snapshot = self._load_snapshot(entry.path, header_only=True)
+                        snapshot_username = snapshot['username']
                         snapshot_time = datetime.fromisoformat(snapshot['datetime'])
-                        
-                        # We want baselines that are:
-                        # 1. Older than current time (obviously)
-                        # 2. Can be newer than target time (we use the closest available baseline)
-                        # This is more flexible for real-world usage
-                        
-                        if snapshot_time <= now:  # Baseline is from the past
-                            time_from_target = abs((snapshot_time - target_time).total_seconds())
-                            if time_from_target < best_time_diff or best_time_diff == float('inf'):
-                                best_snapshot = snapshot
-                                best_time_diff = time_from_target
-                    except:
+                    except (OSError, ValueError, KeyError) as exc:
+                        logger.debug('skip %s: %s', filename, exc)
                         continue
-            
-            if best_snapshot:
-                snapshot_time = datetime.fromisoformat(best_snapshot['datetime'])
+                
+                snapshot_ts = snapshot_time.timestamp()
+                # Count and kind aren't in the filename; left NULL so the file is read when picked
+                entries.append((entry.path, snapshot_username, snapshot_time.isoformat(), snapshot_ts, None, None))
+                
+                if snapshot_username != username:
+                    continue
+                
+                # We want baselines that are:
+                # 1. Older than current time (obviously)
+                # 2. Can be newer than target time (we use the closest available baseline)
+                # This is more flexible for real-world usage
+                
+                if snapshot_ts <= now_ts:  # Baseline is from the past
+                    time_from_target = abs(snapshot_ts - target_ts)
+                    if time_from_target < best_time_diff:
+                        best_path = entry.path
+                        best_time_diff = time_from_target
+        
+        self._index_snapshots(entries)
+        return (best_path, None, None, None, None) if best_path else None
+    
+    def _find_baseline(self, username, time_window_hours, now):
+        """Locate the baseline closest to X hours ago; returns (path, header) or None.
+        
+        The header comes from the index row when it has the follower count, so
+        the snapshot file itself is only opened later, if at all.
+        """
+        target_time = now - timedelta(hours=time_window_hours)
+        
+        print(f"🕐 Looking for baseline from: {target_time.strftime('%H:%M:%S')} ({time_window_hours}h ago)")
+        
+        # Look up the closest snapshot in the index; rebuild it from the files if missing
+        best = None
+        if os.path.exists(SNAPSHOT_INDEX):
+            try:
+                best = self._query_index(username, now, target_time)
+            except sqlite3.Error as e:
+                print(f"⚠️ Snapshot index unavailable ({e}), scanning files...")
+                best = self._scan_snapshots(username, now, target_time)
+        else:
+            best = self._scan_snapshots(username, now, target_time)
+        
+        if best:
+            best_path, datetime_iso, unix_timestamp, follower_count, metadata_only = best
+            try:
+                if follower_count is not None:
+                    header = {
+                        'username': username,
+                        'datetime': datetime_iso,
+                        'unix_timestamp': unix_timestamp,
+                        'follower_count': follower_count,
+                        'metadata_only': bool(metadata_only)
+                    }
+                else:
+                    # Row rebuilt by a directory scan: read just the header line
+                    header = self._load_snapshot(best_path, header_only=True)
+                snapshot_time = datetime.fromisoformat(header['datetime'])
                 actual_hours = (now - snapshot_time).total_seconds() / 3600
-                print(f"✅ Found baseline from {actual_hours:.1f}h ago: {os.path.basename(files[0])}")
-                return best_snapshot
+                print(f"✅ Found baseline from {actual_hours:.1f}h ago: {os.path.basename(best_path)}")
+                return best_path, header
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not load baseline {best_path}: {e}")
         
         # No suitable baseline found - this is expected for the first run
         print(f"⚠️ No baseline snapshot found from {time_window_hours}h ago")
@@ -141,93 +401,105 @@ class LiveOrientationPicker:
         print(f"   • First time running the picker for this time window")
         print(f"   • Need to wait {time_window_hours}h and run again")
         print(f"   • Or use a shorter time window (0.5h or 1h)")
-        
-        # Create a snapshot for future use, but don't use it now
-        print(f"📄 Creating baseline for future use...")
-        current_count = self.get_followers_count(username)
-        if current_count:
-            timestamp = now.strftime("%Y%m%d_%H%M%S")
-            filename = f"live_snapshots/{username}_baseline_{timestamp}.json"
-            
-            snapshot = {
-                'username': username,
-                'datetime': now.isoformat(),
-                'unix_timestamp': now.timestamp(),
-                'follower_count': current_count,
-                'metadata_only': True  # Lightweight baseline
-            }
-            
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(snapshot, f, indent=2, ensure_ascii=False)
-                print(f"💾 Baseline saved: {filename}")
-                print(f"📊 Follower count: {current_count}")
-                print(f"⏰ Timestamp: {now.strftime('%H:%M:%S')}")
-            except Exception as e:
-                print(f"⚠️ Could not save baseline: {e}")
-        
         return None
     
-    def find_recent_followers(self, username, time_window_hours):
+    def _load_baseline(self, path, header):
+        """Full baseline for a located snapshot (metadata-only baselines are just the header)"""
+        if header.get('metadata_only') or 'usernames_lower' in header or 'followers' in header:
+            return header
+        return self._load_snapshot(path)
+    
+    def get_baseline_snapshot(self, username, time_window_hours, now=None):
+        """Get baseline snapshot from X hours ago (relative to now, default: the current time)"""
+        found = self._find_baseline(username, time_window_hours, now or datetime.now())
+        if not found:
+            return None
+        try:
+            return self._load_baseline(*found)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Could not load baseline {found[0]}: {e}")
+            return None
+    
+    def find_recent_followers(self, username, time_window_hours, now=None):
         """Main function: find followers from the selected time window"""
+        return self._find_recent(username, time_window_hours, sample_winner=False, now=now)
+    
+    def find_recent_winner(self, username, time_window_hours, now=None):
+        """Pick one recent follower without building the new-follower list; returns (winner, count)"""
+        return self._find_recent(username, time_window_hours, sample_winner=True, now=now)
+    
+    def _find_recent(self, username, time_window_hours, sample_winner, now=None):
+        """Shared flow: the new-follower list, or (winner, count) when sample_winner is set"""
+        empty = (None, 0) if sample_winner else []
+        # One clock reading per run keeps the baseline lookup and every log line consistent
+        now = now or datetime.now()
+        now_str = now.strftime('%H:%M:%S')
+        
         print(f"\n🎯 FINDING RECENT FOLLOWERS")
         print("=" * 50)
         
-        # Get baseline (followers from X hours ago)
-        baseline = self.get_baseline_snapshot(username, time_window_hours)
+        # Locate the baseline (followers from X hours ago) and get the current follower
+        # count in parallel; the cheap count decides how many followers are worth fetching
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            baseline_future = executor.submit(self._find_baseline, username, time_window_hours, now)
+            count_future = executor.submit(self.get_followers_count, username)
+            found = baseline_future.result()
+            current_count = count_future.result()
+            
+            followers_future = None
+            baseline = found[1] if found else None
+            if baseline and not baseline.get('metadata_only', False):
+                # Full baseline: start the follower fetch now and read the snapshot file while it runs
+                if current_count is not None:
+                    growth = current_count - baseline.get('follower_count', 0)
+                    needed = min(max(growth * 2, 20), self.max_followers)
+                else:
+                    needed = self.max_followers
+                followers_future = executor.submit(self.get_followers, username, needed)
+                try:
+                    baseline = self._load_baseline(*found)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Could not load baseline {found[0]}: {e}")
+                    baseline = None
+        
         if not baseline:
             print("\n❌ CANNOT ANALYZE WITHOUT BASELINE")
             print(f"� Creating baseline snapshot...")
             
-            # Just get count for quick baseline creation
-            current_count = self.get_followers_count(username)
             if current_count:
-                now = datetime.now()
-                timestamp = now.strftime("%Y%m%d_%H%M%S")
-                filename = f"live_snapshots/{username}_baseline_{timestamp}.json"
-                
-                # Create lightweight baseline with just metadata
-                snapshot = {
-                    'username': username,
-                    'datetime': now.isoformat(),
-                    'unix_timestamp': now.timestamp(),
-                    'follower_count': current_count,
-                    'metadata_only': True  # Mark as lightweight
-                }
-                
-                try:
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        json.dump(snapshot, f, indent=2, ensure_ascii=False)
-                    print(f"💾 Baseline created: {filename}")
-                    print(f"📊 Follower count: {current_count}")
-                    print(f"⏰ Timestamp: {now.strftime('%H:%M:%S')}")
-                except Exception as e:
-                    print(f"⚠️ Could not save baseline: {e}")
+                # Small accounts fit in one fetch, so store the full list for exact diffs later;
+                # otherwise (or if the API returned fewer than the count) keep just the count
+                followers = None
+                if followers_future is not None:
+                    # The snapshot failed to load after the fetch was started; use that
+                    # response rather than paying for a second follower call
+                    followers = followers_future.result()
+                elif current_count <= self.max_followers:
+                    followers = self.get_followers(username, max_followers=self.max_followers)
+                if followers is not None and len(followers) < current_count:
+                    followers = None
+                self._save_baseline(username, current_count, now, followers)
             
             print(f"\n💡 SOLUTION:")
             print(f"   1. Baseline created with {current_count} followers")
             print(f"   2. Wait {time_window_hours} hour(s)")
             print(f"   3. Run again to find new followers")
             print(f"\n   OR try a shorter time window (0.5h or 1h)")
-            return []
-        
-        # Get current followers
-        current_followers = self.get_followers(username)
-        if not current_followers:
-            print("❌ Could not fetch current followers")
-            return []
+            return empty
         
         # Check if we have a metadata-only baseline
         if baseline.get('metadata_only', False):
             # For metadata-only baselines, we can only detect growth by count
             baseline_count = baseline.get('follower_count', 0)
-            current_count = len(current_followers)
+            if current_count is None:
+                print("❌ Could not fetch current follower count")
+                return empty
             
             print(f"\n📊 METADATA-ONLY ANALYSIS:")
             print(f"   ⏰ Time window: Last {time_window_hours} hour(s)")
             baseline_time = datetime.fromisoformat(baseline['datetime'])
             print(f"   📅 Baseline: {baseline_time.strftime('%H:%M:%S')}")
-            print(f"   📅 Current: {datetime.now().strftime('%H:%M:%S')}")
+            print(f"   📅 Current: {now_str}")
             print(f"   👥 Baseline followers: {baseline_count}")
             print(f"   👥 Current followers: {current_count}")
             
@@ -235,8 +507,16 @@ class LiveOrientationPicker:
             print(f"   📈 Growth: +{growth}")
             
             if growth <= 0:
+                # Nobody new, so the follower list is never downloaded
                 print(f"   ❌ No growth detected in {time_window_hours}h window")
-                return []
+                return empty
+            
+            current_followers = self.get_followers(
+                username, max_followers=min(max(growth + GROWTH_FETCH_BUFFER, 20), self.max_followers)
+            )
+            if not current_followers:
+                print("❌ Could not fetch current followers")
+                return empty
             
             # For metadata-only, we assume the most recent followers are the new ones
             # This is not 100% accurate but the best we can do without full baseline
@@ -246,34 +526,58 @@ class LiveOrientationPicker:
             # Return the most recent followers (assuming API returns in recent order)
             new_followers = current_followers[:growth]
             print(f"   🆕 New followers to pick from: {len(new_followers)}")
+            if sample_winner:
+                return _RNG.choice(new_followers), len(new_followers)
             return new_followers
         
-        # Full baseline with actual follower list
-        baseline_usernames = set()
-        for follower in baseline.get('followers', []):
-            username_field = follower.get('username', '')
-            if username_field:
-                baseline_usernames.add(username_field.lower())
+        # Full baseline with actual follower list, fetched above with a size taken from
+        # the count delta: twice the net growth covers follows offset by unfollows
+        current_followers = followers_future.result()
+        if not current_followers:
+            print("❌ Could not fetch current followers")
+            return empty
         
-        new_followers = []
-        for follower in current_followers:
-            username_field = follower.get('username', '')
-            if username_field and username_field.lower() not in baseline_usernames:
-                new_followers.append(follower)
+        if 'usernames_lower' in baseline:
+            baseline_usernames = frozenset(baseline['usernames_lower'])
+        else:
+            # Legacy snapshots without the pre-lowercased username column
+            baseline_usernames = frozenset(
+                follower['username'].lower()
+                for follower in baseline.get('followers', ())
+                if follower.get('username')
+            )
+        
+        if sample_winner:
+            # Single pass: never materialise the new-follower list
+            winner, new_count = _sample_new(current_followers, baseline_usernames, _RNG)
+        else:
+            # Diff as a set operation on the dict-keys view, then map names back to follower records
+            current_by_name = {
+                name.lower(): follower
+                for follower in current_followers
+                if (name := follower.get('username'))
+            }
+            new_names = current_by_name.keys() - baseline_usernames
+            new_followers = [current_by_name[name] for name in new_names]
+            new_count = len(new_followers)
         
         # Show results
         baseline_time = datetime.fromisoformat(baseline['datetime'])
         print(f"\n📊 FULL ANALYSIS RESULTS:")
         print(f"   ⏰ Time window: Last {time_window_hours} hour(s)")
         print(f"   📅 Baseline: {baseline_time.strftime('%H:%M:%S')}")
-        print(f"   📅 Current: {datetime.now().strftime('%H:%M:%S')}")
+        print(f"   📅 Current: {now_str}")
         print(f"   👥 Baseline followers: {baseline['follower_count']}")
-        print(f"   👥 Current followers: {len(current_followers)}")
+        if current_count is None:
+            current_count = len(current_followers)
+        print(f"   👥 Current followers: {current_count}")
         
-        growth = len(current_followers) - baseline['follower_count']
+        growth = current_count - baseline['follower_count']
         print(f"   📈 Growth: +{growth}")
-        print(f"   🆕 New followers: {len(new_followers)}")
+        print(f"   🆕 New followers: {new_count}")
         
+        if sample_winner:
+            return winner, new_count
         return new_followers
     
     def select_winner(self, new_followers, time_window_hours):
@@ -286,24 +590,32 @@ class LiveOrientationPicker:
             print(f"   • Make sure people are actually following")
             return None
         
-        winner = random.choice(new_followers)
-        
-        print(f"\n" + "🎉" * 25)
-        print(f"🏆 ORIENTATION WINNER! 🏆")
-        print(f"🎉" * 25)
-        print(f"\n👤 Winner: @{winner.get('username', 'Unknown')}")
-        print(f"📝 Name: {winner.get('full_name', 'No name')}")
+        winner = _RNG.choice(new_followers)
         
+        banner = "🎉" * 25
+        username = winner.get('username', 'Unknown')
         is_private = winner.get('is_private', False)
-        print(f"🔐 Account: {'🔒 Private' if is_private else '🔓 Public'}")
+        
+        # Build the whole announcement and write it once
+        lines = [
+            "\n" + banner,
+            "🏆 ORIENTATION WINNER! 🏆",
+            banner,
+            f"\n👤 Winner: @{username}",
+            f"📝 Name: {winner.get('full_name', 'No name')}",
+            f"🔐 Account: {'🔒 Private' if is_private else '🔓 Public'}",
+        ]
         
         if winner.get('is_verified', False):
-            print(f"✅ Verified Account")
+            lines.append("✅ Verified Account")
         
-        print(f"\n🎊 Congratulations @{winner.get('username')}!")
-        print(f"⏰ Followed in the last {time_window_hours} hour(s)")
-        print(f"🎯 Selected from {len(new_followers)} recent followers")
-        print(f"🎉" * 25)
+        lines += [
+            f"\n🎊 Congratulations @{username}!",
+            f"⏰ Followed in the last {time_window_hours} hour(s)",
+            f"🎯 Selected from {len(new_followers)} recent followers",
+            banner,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return winner
 
@@ -321,6 +633,11 @@ def main():
     if not username:
         print("❌ Username required!")
         return
+    try:
+        username = normalize_username(username)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
     
     # Time window selection
     print(f"\n⏰ SELECT TIME WINDOW:")
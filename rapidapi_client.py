@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+RapidAPI Client Helpers
+=======================
+Shared HTTP plumbing for the follower pickers:
+
+- CachedSession: a pooled keep-alive requests.Session that stores raw API
+  responses in a local SQLite table so repeated runs can skip the network
+  round-trip. Transient failures are retried with exponential backoff; if
+  the API stays down, the last cached response is served instead (enabled
+  and read-only policies only).
+- TokenBucket: paces API calls to the RapidAPI requests-per-minute limit so
+  bursts sleep briefly instead of failing with 429.
+- json_loads / json_dumps: orjson when installed, stdlib json otherwise.
+- normalize_username: local Instagram username check before spending an API call.
+
+Cache policies:
+    enabled     Serve fresh cache hits, fetch and store on miss (default)
+    read-only   Serve fresh cache hits, never write new entries
+    write-only  Always hit the API, but record every response
+    replay      Serve cached responses regardless of age, never hit the API
+    disabled    Plain pass-through to the API
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, stdlib json works the same
+    orjson = None
+
+CACHE_POLICIES = ("enabled", "read-only", "write-only", "replay", "disabled")
+DEFAULT_CACHE_PATH = ".rapidapi_cache.sqlite"
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60  # 1 week
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+_USERNAME_RE = re.compile(r"^[A-Za-z0-9._]{1,30}$")
+DEFAULT_RATE_LIMIT_RPM = 60
+DEFAULT_RATE_LIMIT_STATE = os.path.join("live_snapshots", ".ratelimit")
+
+
+@lru_cache(maxsize=None)
+def _retry_policy(max_retries: int, backoff: float) -> Retry:
+    """Build (once per settings) the urllib3 retry policy shared by every session."""
+    return Retry(
+        total=max(0, max_retries - 1),
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+
+
+def normalize_username(username: str) -> str:
+    """
+    Strip whitespace and a leading @, then validate Instagram's username format.
+
+    Raises:
+        ValueError: If the username cannot be a valid Instagram handle
+    """
+    username = username.strip().lstrip("@")
+    if not _USERNAME_RE.match(username):
+        raise ValueError(f"Invalid Instagram username format: '{username}'")
+    return username
+
+
+def json_loads(data: Any) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode obj as single-line UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+class TokenBucket:
+    """Requests-per-minute token bucket, persisted so pacing survives across runs."""
+
+    def __init__(self, rpm: Optional[float] = None, state_path: Optional[str] = DEFAULT_RATE_LIMIT_STATE):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rpm (float): Allowed requests per minute (default: RAPIDAPI_RPM or 60)
+            state_path (str): JSON file used to persist the bucket (None to keep it in memory)
+        """
+        self.rpm = float(rpm if rpm is not None else os.getenv("RAPIDAPI_RPM", DEFAULT_RATE_LIMIT_RPM))
+        self.state_path = state_path
+        self.request_tokens = self.rpm
+        self.last_update = time.time()
+        self._lock = threading.Lock()
+        self._load_state()
+
+    def _load_state(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.request_tokens = min(self.rpm, float(state["request_tokens"]))
+            self.last_update = float(state["last_update"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump({"request_tokens": self.request_tokens, "last_update": self.last_update}, f)
+        except OSError:
+            pass
+
+    def _refill(self) -> None:
+        now = time.time()
+        elapsed = max(0.0, now - self.last_update)
+        self.request_tokens = min(self.rpm, self.request_tokens + elapsed * self.rpm / 60)
+        self.last_update = now
+
+    def acquire(self) -> None:
+        """Block until a request token is available, then consume it."""
+        with self._lock:
+            self._refill()
+            if self.request_tokens < 1:
+                wait = (1 - self.request_tokens) * 60 / self.rpm
+                print(f"⏳ Rate limit reached, waiting {wait:.1f}s...")
+                time.sleep(wait)
+                self._refill()
+            self.request_tokens -= 1
+            self._save_state()
+
+
+_shared_buckets: Dict[str, TokenBucket] = {}
+_shared_buckets_lock = threading.Lock()
+
+
+def shared_rate_limiter(state_path: str = DEFAULT_RATE_LIMIT_STATE) -> TokenBucket:
+    """Return the process-wide TokenBucket for a state file, so every session shares one budget."""
+    key = os.path.abspath(state_path)
+    with _shared_buckets_lock:
+        bucket = _shared_buckets.get(key)
+        if bucket is None:
+            bucket = _shared_buckets[key] = TokenBucket(state_path=state_path)
+        return bucket
+
+
+class CachedSession:
+    """Wrap a requests.Session with a content-addressed on-disk response cache."""
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        cache_policy: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        """
+        Initialize the cached session.
+
+        Args:
+            headers (Dict[str, str]): Headers sent with every request
+            cache_policy (str): One of CACHE_POLICIES (default: RAPIDAPI_CACHE_POLICY or "enabled")
+            cache_path (str): SQLite file path (default: RAPIDAPI_CACHE_PATH or .rapidapi_cache.sqlite)
+            ttl (float): Seconds a cached response stays fresh (default: RAPIDAPI_CACHE_TTL or 1 week)
+            rate_limiter (TokenBucket): Limiter applied to network calls (default: shared_rate_limiter())
+            max_retries (int): Attempts for timeouts, connection errors, 429 and 5xx responses
+            backoff (float): Retry backoff factor in seconds, doubled after each attempt
+        """
+        self.cache_policy = cache_policy or os.getenv("RAPIDAPI_CACHE_POLICY", "enabled")
+        if self.cache_policy not in CACHE_POLICIES:
+            raise ValueError(
+                f"Invalid cache policy '{self.cache_policy}'. Choose one of: {', '.join(CACHE_POLICIES)}"
+            )
+        self.cache_path = cache_path or os.getenv("RAPIDAPI_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = float(ttl if ttl is not None else os.getenv("RAPIDAPI_CACHE_TTL", DEFAULT_CACHE_TTL))
+
+        self.rate_limiter = rate_limiter or shared_rate_limiter()
+
+        # One pooled keep-alive session per picker; the adapter owns retry/backoff
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=_retry_policy(max_retries, backoff),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if self.cache_policy != "disabled":
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS cache ("
+                        "key TEXT PRIMARY KEY, body BLOB, expires_at REAL, first_page_hash TEXT)"
+                    )
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+                    if "first_page_hash" not in columns:  # cache created by an older version
+                        conn.execute("ALTER TABLE cache ADD COLUMN first_page_hash TEXT")
+                    conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            except sqlite3.Error as e:
+                self._cache_unavailable(e)
+                # Go straight to the network; replay keeps its policy so it fails instead of calling the API
+                if self.cache_policy != "replay":
+                    self.cache_policy = "disabled"
+
+    def _cache_unavailable(self, error: sqlite3.Error) -> None:
+        print(f"⚠️ Response cache unavailable ({self.cache_path}: {error}), using the network")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection (safe to use from any thread)."""
+        return sqlite3.connect(self.cache_path, timeout=10)
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Hash the request URL and parameters into a stable cache key."""
+        raw = f"{url}|{json.dumps(params or {}, sort_keys=True)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _read(self, key: str, allow_stale: bool = False) -> Optional[bytes]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT body, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._cache_unavailable(e)
+            return None
+        if row is None:
+            return None
+        body, expires_at = row
+        if not allow_stale and expires_at <= time.time():
+            return None
+        return body
+
+    def _write(self, key: str, body: bytes, expires_at: Optional[float] = None) -> None:
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, body, expires_at) VALUES (?, ?, ?)",
+                    (key, body, expires_at if expires_at is not None else now + self.ttl),
+                )
+                # Expired rows are kept for one more TTL (stale fallback, unchanged-page reuse), then dropped
+                conn.execute("DELETE FROM cache WHERE expires_at < ?", (now - self.ttl,))
+        except sqlite3.Error as e:
+            self._cache_unavailable(e)
+
+    def serves_from_cache(self, url: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether get_json would answer this request from the cache instead of the network."""
+        if self.cache_policy not in ("enabled", "read-only", "replay"):
+            return False
+        return self._read(self.cache_key(url, params), allow_stale=self.cache_policy == "replay") is not None
+
+    def can_reuse_expired(self, expires_at: Optional[float]) -> bool:
+        """Whether an expired entry may still be served: the policy reads the cache and it isn't due for pruning."""
+        return (
+            self.cache_policy in ("enabled", "read-only")
+            and expires_at is not None
+            and expires_at >= time.time() - self.ttl
+        )
+
+    def cached_entry(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, Optional[str], Optional[float]]:
+        """
+        Return the cached response, its first-page hash and its expiry, ignoring expiry.
+
+        Args:
+            url (str): Endpoint URL
+            params (Dict[str, Any]): Query parameters
+
+        Returns:
+            Tuple[Any, Optional[str], Optional[float]]: Decoded cached response (or None),
+            its stored hash and its expires_at timestamp
+        """
+        if self.cache_policy == "disabled":
+            return None, None, None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT body, first_page_hash, expires_at FROM cache WHERE key = ?",
+                    (self.cache_key(url, params),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._cache_unavailable(e)
+            return None, None, None
+        if row is None:
+            return None, None, None
+        return json_loads(row[0]), row[1], row[2]
+
+    def put_json(
+        self, url: str, params: Optional[Dict[str, Any]], data: Any, expires_at: Optional[float] = None
+    ) -> None:
+        """Store a decoded response under the request's cache key (default: fresh expiry)."""
+        if self.cache_policy in ("enabled", "write-only"):
+            self._write(self.cache_key(url, params), json_dumps(data), expires_at)
+
+    def set_first_page_hash(self, url: str, params: Optional[Dict[str, Any]], digest: str) -> None:
+        """Attach a content hash to a cached first page so later syncs can detect changes."""
+        if self.cache_policy not in ("enabled", "write-only"):
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE cache SET first_page_hash = ? WHERE key = ?", (digest, self.cache_key(url, params))
+                )
+        except sqlite3.Error as e:
+            self._cache_unavailable(e)
+
+    def search_stream(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        pattern: "re.Pattern",
+        scan_bytes: int = 1024,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        **kwargs
+    ) -> Tuple[Optional["re.Match"], Optional[bytes]]:
+        """
+        GET a response as a stream and stop decoding once pattern matches near the start.
+
+        If pattern matches within the first scan_bytes, the rest of the body is
+        drained unparsed (so the keep-alive connection goes back to the pool) and
+        only the match is returned. Otherwise the same response is read to the end
+        and its body is returned (and cached, as get_json would). Cache reads and
+        the stale fallback are bypassed; store what you extract with put_json if
+        replay mode should see it.
+
+        Args:
+            url (str): Endpoint URL
+            params (Dict[str, Any]): Query parameters
+            pattern (re.Pattern): Bytes regex to search for
+            scan_bytes (int): How much of the body to scan before reading it all
+            cache_if (Callable[[Any], bool]): Only cache a complete body whose decoded JSON passes
+            **kwargs: Extra arguments passed to requests (e.g. timeout)
+
+        Returns:
+            Tuple[Optional[re.Match], Optional[bytes]]: The match (body None), or
+            None and the complete body
+
+        Raises:
+            requests.RequestException: If the API request fails
+        """
+        self.rate_limiter.acquire()
+        with self.session.get(url, params=params, stream=True, **kwargs) as response:
+            print(f"📊 Response status: {response.status_code}")
+            response.raise_for_status()
+            body = b""
+            chunks = response.iter_content(chunk_size=scan_bytes)
+            for chunk in chunks:
+                body += chunk
+                if len(body) >= scan_bytes:
+                    break
+            match = pattern.search(body)
+            if match:
+                # Drain without keeping the bytes; an unread body would close the socket
+                for _ in chunks:
+                    pass
+                return match, None
+            body += b"".join(chunks)
+
+        if self.cache_policy in ("enabled", "write-only") and (cache_if is None or cache_if(json_loads(body))):
+            self._write(self.cache_key(url, params), body)
+        return None, body
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        allow_stale: bool = False,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        GET a JSON endpoint, consulting the cache according to the cache policy.
+
+        Args:
+            url (str): Endpoint URL
+            params (Dict[str, Any]): Query parameters
+            allow_stale (bool): Serve an expired cache entry instead of refetching
+            cache_if (Callable[[Any], bool]): Only cache responses that pass this check
+                (e.g. reject empty pages and API error messages)
+            **kwargs: Extra arguments passed to requests (e.g. timeout)
+
+        Returns:
+            Any: Decoded JSON response
+
+        Raises:
+            requests.RequestException: If the API request fails
+            ValueError: If replay mode has no cached response or the body is not JSON
+        """
+        key = self.cache_key(url, params)
+
+        if self.cache_policy in ("enabled", "read-only", "replay"):
+            body = self._read(key, allow_stale=allow_stale or self.cache_policy == "replay")
+            if body is not None:
+                print("💾 Using cached API response")
+                return json_loads(body)
+            if self.cache_policy == "replay":
+                raise ValueError("No cached API response available (cache policy: replay)")
+
+        self.rate_limiter.acquire()
+        try:
+            # Timeouts, connection errors, 429 and 5xx are retried by the mounted adapter
+            response = self.session.get(url, params=params, **kwargs)
+            print(f"📊 Response status: {response.status_code}")
+            response.raise_for_status()
+        except (requests.Timeout, requests.ConnectionError, requests.HTTPError) as e:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and status < 500 and status != 429:
+                raise
+            # Degrade to the last good response rather than failing the run; write-only
+            # callers asked for fresh data only, so they see the error instead
+            stale = self._read(key, allow_stale=True) if self.cache_policy in ("enabled", "read-only") else None
+            if stale is None:
+                raise
+            print(f"⚠️ API unavailable ({e}), using last cached response")
+            return json_loads(stale)
+
+        body = response.content
+        data = json_loads(body)
+
+        if self.cache_policy in ("enabled", "write-only") and (cache_if is None or cache_if(data)):
+            self._write(key, body)
+
+        return data
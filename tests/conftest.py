@@ -0,0 +1,73 @@
+"""Shared fixtures: run every test in a scratch directory with a fake API key and no network."""
+
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rapidapi_client  # noqa: E402
+
+
+class FakeResponse:
+    """Just enough of requests.Response for CachedSession."""
+
+    def __init__(self, body, status_code=200):
+        self.content = body if isinstance(body, bytes) else rapidapi_client.json_dumps(body)
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class FakeAPI:
+    """Stub for requests.Session.get: returns queued responses (the last one repeats) and records each call."""
+
+    def __init__(self):
+        self.responses = []
+        self.calls = []
+
+    def queue(self, *responses):
+        self.responses.extend(responses)
+
+    def get(self, session, url, params=None, **kwargs):
+        self.calls.append(dict(params or {}))
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        if not isinstance(response, FakeResponse):
+            response = FakeResponse(response)
+        return response
+
+
+@pytest.fixture(autouse=True)
+def sandbox(tmp_path, monkeypatch):
+    """Isolate cache, snapshots and rate-limit state in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setenv("RAPIDAPI_RPM", "6000")
+    monkeypatch.delenv("RAPIDAPI_CACHE_POLICY", raising=False)
+    monkeypatch.delenv("LIVE_CACHE_POLICY", raising=False)
+    monkeypatch.setattr(rapidapi_client, "_shared_buckets", {})
+    return tmp_path
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    api = FakeAPI()
+    monkeypatch.setattr(requests.Session, "get", lambda session, url, params=None, **kw: api.get(session, url, params, **kw))
+    return api
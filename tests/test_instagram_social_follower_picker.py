@@ -0,0 +1,97 @@
+import sqlite3
+import time
+from collections import Counter
+
+import pytest
+
+from instagram_social_follower_picker import InstagramSocialFollowerPicker, _extract_username
+
+FIRST_PAGE = {"data": {"count": 4, "items": [{"username": "a"}, {"username": "b"}]}, "pagination_token": "p2"}
+LAST_PAGE = {"data": {"count": 4, "items": [{"username": "c"}, {"username": "d"}]}}
+
+
+def followers(n):
+    return [{"username": f"user{i}"} for i in range(n)]
+
+
+@pytest.fixture
+def picker():
+    return InstagramSocialFollowerPicker("test-key")
+
+
+def test_select_random_winners_returns_k_distinct_followers(picker):
+    winners = picker.select_random_winners(followers(10), k=3)
+    assert len(winners) == 3
+    assert len({w["username"] for w in winners}) == 3
+
+
+def test_select_random_winners_accepts_a_stream(picker):
+    stream = (follower for follower in followers(5))
+    assert len(picker.select_random_winners(stream, k=2)) == 2
+
+
+def test_select_random_winners_takes_everyone_when_k_equals_size(picker):
+    assert picker.select_random_winners(followers(3), k=3) == followers(3)
+
+
+@pytest.mark.parametrize("pool, k", [([], 1), (followers(2), 3), (followers(2), 0)])
+def test_select_random_winners_rejects_impossible_draws(picker, pool, k):
+    with pytest.raises(ValueError):
+        picker.select_random_winners(pool, k=k)
+
+
+def test_select_random_winners_is_roughly_uniform(picker):
+    counts = Counter(
+        picker.select_random_winners(followers(4), k=1)[0]["username"] for _ in range(4000)
+    )
+    assert set(counts) == {f"user{i}" for i in range(4)}
+    assert min(counts.values()) > 800
+
+
+@pytest.mark.parametrize("winner, expected", [
+    ({"username": "a"}, "a"),
+    ({"user": {"username": "b"}}, "b"),
+    ({"pk": 123}, "123"),
+    ({"username": None, "id": "x9"}, "x9"),
+    ({}, "Unknown"),
+])
+def test_extract_username_handles_response_formats(winner, expected):
+    assert _extract_username(winner) == expected
+
+
+def page_expiries(tmp_path):
+    with sqlite3.connect(str(tmp_path / "cache.sqlite")) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT expires_at FROM cache"))
+
+
+def test_fresh_cache_hits_do_not_extend_expiry(tmp_path, fake_api, picker):
+    fake_api.queue(FIRST_PAGE, LAST_PAGE)
+    picker.get_followers("acct", 4)
+    before = page_expiries(tmp_path)
+    assert [f["username"] for f in picker.get_followers("acct", 4)] == ["a", "b", "c", "d"]
+    assert len(fake_api.calls) == 2
+    assert page_expiries(tmp_path) == before
+
+
+def test_unchanged_first_page_reuses_cached_pages(tmp_path, fake_api, picker):
+    fake_api.queue(FIRST_PAGE, LAST_PAGE, FIRST_PAGE)
+    picker.get_followers("acct", 4)
+    with sqlite3.connect(str(tmp_path / "cache.sqlite")) as conn:
+        conn.execute("UPDATE cache SET expires_at = ?", (time.time() - 10,))
+    assert [f["username"] for f in picker.get_followers("acct", 4)] == ["a", "b", "c", "d"]
+    assert len(fake_api.calls) == 3  # only page 1 was fetched again
+
+
+def test_write_only_never_reuses_cached_pages(fake_api):
+    picker = InstagramSocialFollowerPicker("test-key", cache_policy="write-only")
+    fake_api.queue(FIRST_PAGE, LAST_PAGE, FIRST_PAGE, LAST_PAGE)
+    picker.get_followers("acct", 4)
+    picker.get_followers("acct", 4)
+    assert len(fake_api.calls) == 4
+
+
+def test_empty_pages_are_not_cached(fake_api, picker):
+    fake_api.queue({"data": {"items": []}}, FIRST_PAGE, LAST_PAGE)
+    with pytest.raises(ValueError):
+        picker.get_followers("acct", 4)
+    assert len(picker.get_followers("acct", 4)) == 4
@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+import live_orientation_picker
+from live_orientation_picker import SNAPSHOT_DIR, LiveOrientationPicker, _sample_new
+
+
+@pytest.fixture
+def picker():
+    return LiveOrientationPicker()
+
+
+def test_sample_new_with_no_followers():
+    assert _sample_new([], frozenset(), random.Random(0)) == (None, 0)
+
+
+def test_sample_new_skips_baseline_and_null_usernames():
+    current = [{"username": None}, {}, {"username": "Old"}, {"username": "New"}]
+    winner, count = _sample_new(current, frozenset({"old"}), random.Random(0))
+    assert winner == {"username": "New"}
+    assert count == 1
+
+
+def test_sample_new_counts_repeated_usernames_once():
+    current = [{"username": "A"}, {"username": "a"}, {"username": "b"}]
+    assert _sample_new(current, frozenset(), random.Random(0))[1] == 2
+
+
+def test_sample_new_is_roughly_uniform():
+    current = [{"username": f"n{i}"} for i in range(4)] + [{"username": "old"}]
+    counts = Counter(
+        _sample_new(current, frozenset({"old"}), random.Random(seed))[0]["username"] for seed in range(4000)
+    )
+    assert set(counts) == {"n0", "n1", "n2", "n3"}
+    assert min(counts.values()) > 800
+
+
+def test_invalid_live_cache_policy_is_rejected(monkeypatch):
+    monkeypatch.setenv("LIVE_CACHE_POLICY", "enabled")
+    with pytest.raises(ValueError):
+        LiveOrientationPicker()
+
+
+def test_snapshot_round_trip(picker):
+    path = os.path.join(SNAPSHOT_DIR, "acct_baseline_20240101_120000.jsonl.gz")
+    header = {"_header": True, "username": "acct", "follower_count": 2, "usernames_lower": ["a", "b"]}
+    followers = [{"username": "A", "full_name": "Ä"}, {"username": "b"}]
+    picker._write_snapshot(path, header, followers)
+
+    with gzip.open(path, "rb") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == [header] + followers
+    assert not os.path.exists(path + ".tmp")
+
+    snapshot = picker._read_snapshot(path)
+    assert snapshot["usernames_lower"] == ["a", "b"]
+    assert "_header" not in snapshot
+
+
+def test_snapshot_without_username_column_streams_it_from_followers(picker):
+    path = os.path.join(SNAPSHOT_DIR, "acct_baseline_20240101_120000.jsonl.gz")
+    picker._write_snapshot(path, {"_header": True, "username": "acct"}, [{"username": "A"}, {"username": None}])
+    assert picker._read_snapshot(path)["usernames_lower"] == ["a"]
+    assert "usernames_lower" not in picker._read_snapshot(path, header_only=True)
+
+
+def test_legacy_json_snapshots_are_still_readable(picker):
+    path = os.path.join(SNAPSHOT_DIR, "acct_baseline_20240101_120000.json")
+    legacy = {"username": "acct", "datetime": "2024-01-01T12:00:00", "followers": [{"username": "x"}]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(legacy, f, indent=2)
+    assert picker._read_snapshot(path) == legacy
+
+
+def test_full_baseline_stores_sorted_unique_usernames(picker):
+    now = datetime.now() - timedelta(hours=1)
+    picker._save_baseline("acct", 3, now, [{"username": "b"}, {"username": "A"}, {"username": "a"}])
+    baseline = picker.get_baseline_snapshot("acct", 1)
+    assert baseline["usernames_lower"] == ["a", "b"]
+    assert baseline["follower_count"] == 3
+
+
+def test_metadata_only_baseline_is_answered_from_the_index(picker, monkeypatch):
+    picker._save_baseline("acct", 7, datetime.now() - timedelta(hours=1))
+    monkeypatch.setattr(picker, "_load_snapshot", lambda *a, **k: pytest.fail("snapshot file opened"))
+    baseline = picker.get_baseline_snapshot("acct", 1)
+    assert baseline["metadata_only"] is True
+    assert baseline["follower_count"] == 7
+
+
+def test_first_run_makes_one_count_call_and_writes_one_baseline(picker, monkeypatch):
+    calls = []
+    monkeypatch.setattr(picker, "get_followers_count", lambda username: calls.append("count") or 500)
+    assert picker.find_recent_followers("acct", 1) == []
+    assert calls == ["count"]
+    snapshots = [name for name in os.listdir(SNAPSHOT_DIR) if name.endswith(".jsonl.gz")]
+    assert len(snapshots) == 1
+
+
+def test_no_growth_skips_the_follower_download(picker, monkeypatch):
+    picker._save_baseline("acct", 5, datetime.now() - timedelta(hours=1))
+    monkeypatch.setattr(picker, "get_followers_count", lambda username: 5)
+    monkeypatch.setattr(picker, "get_followers", lambda *a, **k: pytest.fail("followers downloaded"))
+    assert picker.find_recent_winner("acct", 1) == (None, 0)
+
+
+def test_full_baseline_diff_finds_new_followers(picker, monkeypatch):
+    picker._save_baseline("acct", 2, datetime.now() - timedelta(hours=1), [{"username": "a"}, {"username": "b"}])
+    current = [{"username": "c"}, {"username": "a"}, {"username": "b"}]
+    monkeypatch.setattr(picker, "get_followers_count", lambda username: 3)
+    monkeypatch.setattr(picker, "get_followers", lambda username, max_followers=None: current)
+    assert picker.find_recent_followers("acct", 1) == [{"username": "c"}]
+    assert picker.find_recent_winner("acct", 1) == ({"username": "c"}, 1)
+
+
+def test_rng_is_shared_at_module_level():
+    assert isinstance(live_orientation_picker._RNG, random.SystemRandom)
@@ -0,0 +1,177 @@
+import sqlite3
+import time
+
+import pytest
+import requests
+
+from conftest import FakeResponse
+from rapidapi_client import CachedSession, TokenBucket, json_dumps, json_loads, normalize_username
+
+URL = "https://api.example/v1/followers"
+PAGE = {"data": {"count": 2, "items": [{"username": "a"}, {"username": "b"}]}}
+
+
+def make_session(tmp_path, policy, **kwargs):
+    return CachedSession(
+        cache_policy=policy,
+        cache_path=str(tmp_path / "cache.sqlite"),
+        rate_limiter=TokenBucket(rpm=6000, state_path=None),
+        **kwargs
+    )
+
+
+def expire_all(tmp_path, age=10):
+    with sqlite3.connect(str(tmp_path / "cache.sqlite")) as conn:
+        conn.execute("UPDATE cache SET expires_at = ?", (time.time() - age,))
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("natgeo", "natgeo"),
+    ("  @nat.geo_1 ", "nat.geo_1"),
+    ("A" * 30, "A" * 30),
+])
+def test_normalize_username_accepts_valid_handles(raw, expected):
+    assert normalize_username(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["", "@", "has space", "bad!name", "a" * 31, "https://instagram.com/x"])
+def test_normalize_username_rejects_invalid_handles(raw):
+    with pytest.raises(ValueError):
+        normalize_username(raw)
+
+
+def test_json_round_trip():
+    obj = {"username": "ünï", "items": [1, 2.5, None, True]}
+    assert json_loads(json_dumps(obj)) == obj
+    assert b"\n" not in json_dumps(obj)
+
+
+def test_enabled_serves_fresh_cache_hits(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    session = make_session(tmp_path, "enabled")
+    assert session.get_json(URL, {"a": 1}) == PAGE
+    assert session.get_json(URL, {"a": 1}) == PAGE
+    assert len(fake_api.calls) == 1
+
+
+def test_enabled_refetches_expired_entries(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    session = make_session(tmp_path, "enabled")
+    session.get_json(URL)
+    expire_all(tmp_path)
+    session.get_json(URL)
+    assert len(fake_api.calls) == 2
+
+
+def test_read_only_serves_but_never_stores(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    make_session(tmp_path, "write-only").get_json(URL)
+    read_only = make_session(tmp_path, "read-only")
+    assert read_only.get_json(URL) == PAGE
+    assert read_only.get_json(URL, {"other": 1}) == PAGE
+    read_only.get_json(URL, {"other": 1})
+    assert len(fake_api.calls) == 3  # recorder + two misses on the uncached key
+
+
+def test_write_only_always_fetches_and_records(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    session = make_session(tmp_path, "write-only")
+    session.get_json(URL)
+    session.get_json(URL)
+    assert len(fake_api.calls) == 2
+    assert make_session(tmp_path, "replay").get_json(URL) == PAGE
+
+
+def test_replay_never_calls_the_api(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    make_session(tmp_path, "write-only").get_json(URL)
+    expire_all(tmp_path)
+    replay = make_session(tmp_path, "replay")
+    assert replay.get_json(URL) == PAGE  # age is ignored
+    with pytest.raises(ValueError):
+        replay.get_json(URL, {"missing": 1})
+    assert len(fake_api.calls) == 1
+
+
+def test_disabled_is_a_pass_through(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    session = make_session(tmp_path, "disabled")
+    session.get_json(URL)
+    session.get_json(URL)
+    assert len(fake_api.calls) == 2
+    assert not (tmp_path / "cache.sqlite").exists()
+
+
+def test_invalid_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        make_session(tmp_path, "sometimes")
+
+
+def test_cache_if_rejects_bad_responses(tmp_path, fake_api):
+    fake_api.queue({"data": {"items": []}}, PAGE)
+    session = make_session(tmp_path, "enabled")
+    has_items = lambda data: bool(data["data"]["items"])
+    assert session.get_json(URL, cache_if=has_items) == {"data": {"items": []}}
+    assert session.get_json(URL, cache_if=has_items) == PAGE
+    assert session.get_json(URL, cache_if=has_items) == PAGE
+    assert len(fake_api.calls) == 2
+
+
+@pytest.mark.parametrize("failure", [
+    requests.ConnectionError("down"),
+    requests.Timeout("slow"),
+])
+def test_enabled_falls_back_to_stale_cache_when_api_is_down(tmp_path, fake_api, failure):
+    fake_api.queue(PAGE, failure)
+    session = make_session(tmp_path, "enabled")
+    session.get_json(URL)
+    expire_all(tmp_path)
+    assert session.get_json(URL) == PAGE
+
+
+def test_write_only_never_serves_stale_data(tmp_path, fake_api):
+    fake_api.queue(PAGE, requests.ConnectionError("down"))
+    session = make_session(tmp_path, "write-only")
+    session.get_json(URL)
+    with pytest.raises(requests.ConnectionError):
+        session.get_json(URL)
+
+
+def test_client_errors_are_not_masked_by_the_cache(tmp_path, fake_api):
+    fake_api.queue(PAGE, FakeResponse(b"{}", status_code=404))
+    session = make_session(tmp_path, "enabled")
+    session.get_json(URL)
+    expire_all(tmp_path)
+    with pytest.raises(requests.HTTPError):
+        session.get_json(URL)
+
+
+def test_expired_rows_are_pruned_after_a_further_ttl(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    session = make_session(tmp_path, "enabled", ttl=60)
+    session.get_json(URL, {"old": 1})
+    expire_all(tmp_path, age=120)
+    session.get_json(URL, {"new": 1})
+    assert session.cached_entry(URL, {"old": 1})[0] is None
+    assert session.cached_entry(URL, {"new": 1})[0] == PAGE
+
+
+def test_unusable_cache_path_falls_back_to_the_network(tmp_path, fake_api):
+    fake_api.queue(PAGE)
+    session = CachedSession(
+        cache_policy="enabled",
+        cache_path=str(tmp_path / "missing" / "cache.sqlite"),
+        rate_limiter=TokenBucket(rpm=6000, state_path=None),
+    )
+    assert session.cache_policy == "disabled"
+    assert session.get_json(URL) == PAGE
+
+
+def test_token_bucket_persists_its_state(tmp_path):
+    state = str(tmp_path / ".ratelimit")
+    bucket = TokenBucket(rpm=60, state_path=state)
+    for _ in range(5):
+        bucket.acquire()
+    restored = TokenBucket(rpm=60, state_path=state)
+    assert restored.request_tokens == pytest.approx(bucket.request_tokens)
+    assert restored.request_tokens < 60
@@ -7,78 +7,152 @@ Simple Flask app for Instagram winner selection.
 
 import os
 import sys
-import random
+import math
 from datetime import datetime
+from functools import lru_cache
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 
+# Optional speed-ups: faster JSON encoding and gzip/Brotli responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Load environment variables
 load_dotenv()
 
+# Configuration is read once at import; handlers use these constants
+RAPIDAPI_KEY = os.getenv('RAPIDAPI_KEY')
+SECRET_KEY = os.getenv('SECRET_KEY', 'raffle-secret-key-2024')
+
+# Same ceiling as the count input in index.html/script.js; count drives API pagination
+MAX_GENERAL_COUNT = 500
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify/request.get_json backed by orjson; falls back to Flask's encoder for unknown types"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
-app.secret_key = os.getenv('SECRET_KEY', 'raffle-secret-key-2024')
+app.secret_key = SECRET_KEY
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+if Compress is not None:
+    app.config['COMPRESS_MIN_SIZE'] = 1024  # small JSON replies aren't worth compressing
+    Compress(app)
 
 # Import picker modules with error handling
 try:
     from instagram_social_follower_picker import InstagramSocialFollowerPicker
     from live_orientation_picker import LiveOrientationPicker
+    from rapidapi_client import normalize_username
     MODULES_LOADED = True
 except ImportError as e:
     print(f"Warning: Could not import picker modules: {e}")
     MODULES_LOADED = False
 
+# One picker per API key for the whole process, so the pooled HTTP session,
+# cache and rate limiter survive across requests
+@lru_cache(maxsize=1)
+def _orientation_picker(api_key):
+    return LiveOrientationPicker()
+
+@lru_cache(maxsize=1)
+def _general_picker(api_key):
+    return InstagramSocialFollowerPicker(api_key)
+
+def _validate_general(data):
+    """Return the number of followers to fetch for a general pick"""
+    try:
+        count = int(data.get('count', 50))
+    except (TypeError, ValueError):
+        raise ValueError('Follower count must be a whole number')
+    if not 1 <= count <= MAX_GENERAL_COUNT:
+        raise ValueError(f'Follower count must be between 1 and {MAX_GENERAL_COUNT}')
+    return count
+
+def _validate_orientation(data):
+    """Return the time window (hours) for an orientation pick"""
+    try:
+        time_window = float(data.get('time_window', 1.0))
+    except (TypeError, ValueError):
+        raise ValueError('Time window must be a number of hours')
+    if not math.isfinite(time_window) or time_window <= 0:
+        raise ValueError('Time window must be a positive, finite number of hours')
+    return time_window
+
 @app.route('/')
 def index():
     """Main page with both picker options"""
     return render_template('index.html')
 
 @app.route('/api/pick', methods=['POST'])
-def api_pick():
+def api_pick(pick_type=None):
     """Unified API endpoint for both general and orientation picking"""
     if not MODULES_LOADED:
         return jsonify({'error': 'Server configuration error. Picker modules not available.'}), 500
     
+    now = datetime.now()
     try:
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
             
         username = data.get('username', '').strip()
-        pick_type = data.get('type', 'general')
+        # The legacy per-type routes fix pick_type and expect their old response fields
+        legacy = pick_type is not None
+        pick_type = pick_type or data.get('type', 'general')
         
         if not username:
             return jsonify({'error': 'Username is required'}), 400
+        try:
+            username = normalize_username(username)
+            if pick_type == 'orientation':
+                time_window = _validate_orientation(data)
+            else:
+                count = _validate_general(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Check API key first
-        api_key = os.getenv('RAPIDAPI_KEY')
+        api_key = RAPIDAPI_KEY
         if not api_key:
             return jsonify({'error': 'API key not configured. Please check server configuration.'}), 500
         
         if pick_type == 'orientation':
             # Orientation-based picking
-            time_window = float(data.get('time_window', 1.0))
             try:
-                picker = LiveOrientationPicker()
-                recent_followers = picker.find_recent_followers(username, time_window)
+                picker = _orientation_picker(api_key)
+                winner, total_count = picker.find_recent_winner(username, time_window, now=now)
             except ValueError as e:
                 return jsonify({'error': f'Configuration error: {str(e)}'}), 500
             
-            if not recent_followers:
+            if not winner:
                 return jsonify({
                     'error': f'No new followers found in the last {time_window} hour(s)'
                 }), 400
             
-            winner = random.choice(recent_followers)
-            total_count = len(recent_followers)
             extra_info = f"from {total_count} new followers in {time_window}h"
             
         else:
             # General picking
-            count = int(data.get('count', 50))
-            picker = InstagramSocialFollowerPicker(api_key)
+            picker = _general_picker(api_key)
             followers = picker.get_followers(username, count)
             
             if not followers:
@@ -91,7 +165,7 @@ def api_pick():
             total_count = len(followers)
             extra_info = f"from {total_count} total followers"
         
-        return jsonify({
+        result = {
             'success': True,
             'winner': {
                 'username': winner.get('username', 'Unknown'),
@@ -101,25 +175,38 @@ def api_pick():
                 'profile_pic_url': winner.get('profile_pic_url', '')
             },
             'info': extra_info,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
+            'timestamp': now.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if legacy:
+            if pick_type == 'orientation':
+                result['recent_followers_count'] = total_count
+                result['time_window'] = time_window
+            else:
+                result['total_followers'] = total_count
+        return jsonify(result)
     
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+# Legacy per-type endpoints, still used by the *_old.html templates
+app.add_url_rule('/api/general-pick', 'general_pick', api_pick,
+                 methods=['POST'], defaults={'pick_type': 'general'})
+app.add_url_rule('/api/orientation-pick', 'orientation_pick', api_pick,
+                 methods=['POST'], defaults={'pick_type': 'orientation'})
+
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
         'modules_loaded': MODULES_LOADED,
-        'api_key_configured': bool(os.getenv('RAPIDAPI_KEY')),
+        'api_key_configured': bool(RAPIDAPI_KEY),
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
 if __name__ == '__main__':
     # Check configuration
-    if not os.getenv('RAPIDAPI_KEY'):
+    if not RAPIDAPI_KEY:
         print("⚠️  Warning: RAPIDAPI_KEY not found in .env file")
     
     if not MODULES_LOADED: